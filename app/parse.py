@@ -1,8 +1,25 @@
+import atexit
 import csv
+import os
+import queue
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter
+from typing import Iterable, Iterator
 from urllib.parse import urljoin
 
+import httpx
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 from selenium import webdriver
+from selenium.common.exceptions import (
+    TimeoutException,
+    WebDriverException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions
@@ -10,9 +27,154 @@ from selenium.webdriver.support import expected_conditions
 
 BASE_URL = "https://webscraper.io/"
 HOME_URL = urljoin(BASE_URL, "test-sites/e-commerce/more/")
-
-
-@dataclass
+PAGES = {
+    "home.csv": HOME_URL,
+    "computers.csv": urljoin(HOME_URL, "computers"),
+    "laptops.csv": urljoin(HOME_URL, "computers/laptops"),
+    "tablets.csv": urljoin(HOME_URL, "computers/tablets"),
+    "phones.csv": urljoin(HOME_URL, "phones"),
+    "touch.csv": urljoin(HOME_URL, "phones/touch"),
+}
+# Only these pages paginate with the JS "More" button and need a browser,
+# the rest are server-rendered and fetched over plain HTTP.
+MORE_BUTTON_PAGES = frozenset({"laptops.csv", "tablets.csv", "touch.csv"})
+
+COOKIE_BUTTON_LOCATOR = (By.ID, "cookieBannerBtn")
+MORE_BUTTON_LOCATOR = (By.CLASS_NAME, "btn-primary")
+COOKIE_BUTTON_IS_CLICKABLE = expected_conditions.element_to_be_clickable(
+    COOKIE_BUTTON_LOCATOR
+)
+MORE_BUTTON_IS_CLICKABLE = expected_conditions.element_to_be_clickable(
+    MORE_BUTTON_LOCATOR
+)
+CARD_SELECTOR = ".thumbnail"
+TITLE_SELECTOR = ".title"
+DESCRIPTION_SELECTOR = ".description"
+PRICE_SELECTOR = ".price"
+STAR_SELECTOR = ".ws-icon-star"
+REVIEWS_SELECTOR = "span[itemprop='reviewCount']"
+
+# Keep clicking "More" in the browser until the button is gone. A mutation
+# observer reacts as soon as each batch of cards is inserted, instead of
+# polling the page on a timer. The button may show up after the page is
+# interactive, so the script waits up to the appear timeout for it before
+# the first click. After that, a hidden button only counts as "all loaded"
+# once the last batch has arrived and the button stays hidden for the
+# grace period. A click that adds no cards within the click timeout is
+# retried, and the script gives up with false after the retries. The stop
+# hook is kept on window so the WebDriver fallback can detach the observer
+# before it starts clicking itself.
+CLICK_ALL_MORE_JS = """
+const [appearTimeout, hiddenGrace, clickTimeout, maxRetries, done] = arguments;
+const cardCount = () => document.querySelectorAll(".thumbnail").length;
+const visibleMoreButton = () => {
+    const button = document.querySelector(".btn-primary");
+    return button && button.offsetParent !== null ? button : null;
+};
+let cardsBeforeClick = null;
+let retriesLeft = maxRetries;
+let clickTimer = null;
+let hiddenTimer = null;
+
+const observer = new MutationObserver(step);
+
+function stop() {
+    observer.disconnect();
+    clearTimeout(clickTimer);
+    clearTimeout(hiddenTimer);
+}
+
+function finish(allLoaded) {
+    stop();
+    done(allLoaded);
+}
+
+function step() {
+    if (cardsBeforeClick !== null) {
+        if (cardCount() <= cardsBeforeClick) {
+            return;
+        }
+        clearTimeout(clickTimer);
+        retriesLeft = maxRetries;
+    }
+    const button = visibleMoreButton();
+    if (!button) {
+        if (hiddenTimer === null) {
+            const wait = cardsBeforeClick === null
+                ? appearTimeout
+                : hiddenGrace;
+            hiddenTimer = setTimeout(finishIfStillHidden, wait);
+        }
+        return;
+    }
+    clearTimeout(hiddenTimer);
+    hiddenTimer = null;
+    click(button);
+}
+
+function finishIfStillHidden() {
+    hiddenTimer = null;
+    if (visibleMoreButton()) {
+        return step();
+    }
+    finish(true);
+}
+
+function click(button) {
+    cardsBeforeClick = cardCount();
+    button.click();
+    clickTimer = setTimeout(retryClick, clickTimeout);
+}
+
+function retryClick() {
+    const button = visibleMoreButton();
+    if (retriesLeft === 0 || !button) {
+        return finish(false);
+    }
+    retriesLeft -= 1;
+    click(button);
+}
+
+window.stopClickingMore = stop;
+observer.observe(document.body, {
+    childList: true,
+    subtree: true,
+    attributes: true,
+    attributeFilter: ["style", "class"],
+});
+step();
+"""
+STOP_CLICKING_MORE_JS = """
+if (window.stopClickingMore) {
+    window.stopClickingMore();
+}
+"""
+MORE_APPEAR_TIMEOUT_MS = 5000
+MORE_HIDDEN_GRACE_MS = 1000
+MORE_CLICK_TIMEOUT_MS = 3000
+MORE_CLICK_RETRIES = 2
+SCRIPT_TIMEOUT = 60
+CARD_COUNT_JS = f"return document.querySelectorAll('{CARD_SELECTOR}').length;"
+MORE_FALLBACK_TIMEOUT = SCRIPT_TIMEOUT
+COOKIE_WAIT_TIMEOUT = 1.5
+MORE_WAIT_TIMEOUT = 2
+WAIT_POLL_FREQUENCY = 0.05
+DISK_CACHE_SIZE = 100 * 1024 * 1024
+# Stylesheets stay enabled: card text and "More" button visibility
+# depend on them.
+BLOCKED_RESOURCE_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+]
+CLEAR_STORAGE_JS = """
+try {
+    window.localStorage.clear();
+    window.sessionStorage.clear();
+} catch (error) {}
+"""
+
+
+@dataclass(slots=True, frozen=True)
 class Product:
     title: str
     description: str
@@ -21,139 +183,358 @@ class Product:
     num_of_reviews: int
 
 
-def _create_driver() -> webdriver.Chrome:
-    """Create Chrome driver in headless mode."""
+class ProductParseError(ValueError):
+    """Raised when a product card is missing a field or has a bad number."""
+
+
+CSV_FIELDS = ("title", "description", "price", "rating", "num_of_reviews")
+PRODUCT_ROW = attrgetter(*CSV_FIELDS)
+
+
+def _create_driver(remote_url: str | None = None) -> webdriver.Remote:
+    """
+    Create Chrome driver in headless mode
+    with images and web fonts disabled.
+    Navigation returns on DOMContentLoaded instead of the full load.
+    Local drivers keep their HTTP cache in a temporary profile directory.
+    If remote_url is given, the session is opened on a Selenium Grid.
+    """
     options = webdriver.ChromeOptions()
+    options.page_load_strategy = "eager"
     options.add_argument("--headless=new")
     options.add_argument("--window-size=1920,1080")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option(
+        "prefs", {"profile.managed_default_content_settings.images": 2}
+    )
+
+    if remote_url:
+        driver = webdriver.Remote(
+            command_executor=remote_url, options=options
+        )
+    else:
+        profile_dir = tempfile.mkdtemp(prefix="scrape-profile-")
+        atexit.register(shutil.rmtree, profile_dir, ignore_errors=True)
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument(f"--disk-cache-size={DISK_CACHE_SIZE}")
+
+        driver = webdriver.Chrome(options=options)
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": BLOCKED_RESOURCE_URLS}
+        )
+
+    driver.set_script_timeout(SCRIPT_TIMEOUT)
+
+    return driver
+
+
+class DriverPool:
+    """
+    Thread-safe pool of Chrome drivers shared between scraping workers.
+    Drivers are started on first demand, so the number of browsers never
+    exceeds the number of workers borrowing them at the same time.
+    Returned drivers are reset instead of relaunched to keep Chrome warm.
+    """
+
+    def __init__(self, remote_url: str | None = None) -> None:
+        self._remote_url = remote_url
+        self._idle_drivers: queue.Queue[webdriver.Remote] = queue.Queue()
+
+    @contextmanager
+    def borrow(self) -> Iterator[webdriver.Remote]:
+        """Take an idle driver (or start a new one) for the block."""
+        driver = self._take_driver()
+
+        try:
+            yield driver
+        finally:
+            self._give_back(driver)
+
+    def close(self) -> None:
+        """
+        Quit every driver started by the pool.
+        A driver that fails to quit does not stop the rest from closing.
+        """
+        while not self._idle_drivers.empty():
+            with suppress(WebDriverException):
+                self._idle_drivers.get_nowait().quit()
+
+    def _take_driver(self) -> webdriver.Remote:
+        """Return an idle driver or start a new one."""
+        try:
+            return self._idle_drivers.get_nowait()
+        except queue.Empty:
+            return _create_driver(self._remote_url)
+
+    def _give_back(self, driver: webdriver.Remote) -> None:
+        """
+        Clear browser state and return the driver to the idle queue.
+        A driver that fails to reset is treated as dead and dropped.
+        """
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script(CLEAR_STORAGE_JS)
+        except WebDriverException:
+            with suppress(WebDriverException):
+                driver.quit()
+            return
 
-    return webdriver.Chrome(options=options)
+        self._idle_drivers.put(driver)
 
 
-def _accept_cookies(driver: webdriver.Chrome) -> None:
+def _accept_cookies(driver: webdriver.Remote) -> None:
     """Click accept cookies button if it appears."""
     try:
-        wait = WebDriverWait(driver, 3)
-        accept_button = wait.until(
-
-            expected_conditions.element_to_be_clickable(
-                (By.ID, "cookieBannerBtn")
-            )
+        wait = WebDriverWait(
+            driver, COOKIE_WAIT_TIMEOUT, poll_frequency=WAIT_POLL_FREQUENCY
         )
+        accept_button = wait.until(COOKIE_BUTTON_IS_CLICKABLE)
         accept_button.click()
     except Exception:
         pass
 
 
-def _parse_products_from_page(driver: webdriver.Chrome) -> list[Product]:
-    """Parse all products currently loaded on the page."""
-    products = []
+def _card_count(driver: webdriver.Remote) -> int:
+    """Count product cards currently on the page."""
+    return driver.execute_script(CARD_COUNT_JS)
 
-    product_cards = driver.find_elements(By.CLASS_NAME, "thumbnail")
 
-    for card in product_cards:
-        title = card.find_element(
-            By.CLASS_NAME, "title"
-        ).get_attribute("title").strip()
-        description = card.find_element(
-            By.CLASS_NAME, "description"
-        ).text.strip()
+def _click_more_until_hidden(driver: webdriver.Remote) -> None:
+    """
+    Click 'More' button with WebDriver until it stops being clickable,
+    waiting for each batch of cards before the next click.
+    Raise TimeoutException if a click adds no cards
+    or the button is still shown after MORE_FALLBACK_TIMEOUT seconds.
+    """
+    button_wait = WebDriverWait(
+        driver, MORE_WAIT_TIMEOUT, poll_frequency=WAIT_POLL_FREQUENCY
+    )
+    batch_wait = WebDriverWait(
+        driver,
+        MORE_CLICK_TIMEOUT_MS / 1000,
+        poll_frequency=WAIT_POLL_FREQUENCY,
+    )
+    deadline = time.monotonic() + MORE_FALLBACK_TIMEOUT
 
-        price_text = card.find_element(By.CLASS_NAME, "price").text.strip()
-        price = float(price_text.replace("$", ""))
+    while True:
+        try:
+            more_button = button_wait.until(MORE_BUTTON_IS_CLICKABLE)
+        except TimeoutException:
+            return
 
-        rating_elements = card.find_elements(By.CLASS_NAME, "ws-icon-star")
-        rating = len(rating_elements)
+        if time.monotonic() > deadline:
+            raise TimeoutException(
+                f"'More' button still shown after {MORE_FALLBACK_TIMEOUT} s"
+            )
 
-        num_of_reviews = int(card.find_element(
-            By.CSS_SELECTOR, "span[itemprop='reviewCount']"
-        ).text.strip())
+        cards_before_click = _card_count(driver)
+        driver.execute_script("arguments[0].click();", more_button)
+        batch_wait.until(
+            lambda waited_driver: (
+                _card_count(waited_driver) > cards_before_click
+            ),
+            "'More' click added no cards",
+        )
 
-        products.append(
-            Product(
-                title=title,
-                description=description,
-                price=price,
-                rating=rating,
-                num_of_reviews=num_of_reviews,
+
+def _normalize_whitespace(text: str) -> str:
+    """Collapse whitespace runs like Selenium's rendered element text."""
+    return " ".join(text.split())
+
+
+def _find_in_card(card: LexborNode, selector: str) -> LexborNode:
+    """Return the first card element matching selector or fail loudly."""
+    node = card.css_first(selector)
+
+    if node is None:
+        raise ProductParseError(f"Product card has no {selector!r} element")
+
+    return node
+
+
+def _parse_products_from_html(html: str) -> Iterator[Product]:
+    """Lazily parse product cards from raw page html."""
+    for card in LexborHTMLParser(html).css(CARD_SELECTOR):
+        title = _find_in_card(card, TITLE_SELECTOR).attributes.get("title")
+        description = _find_in_card(card, DESCRIPTION_SELECTOR).text()
+        price_text = _find_in_card(card, PRICE_SELECTOR).text().strip()
+        reviews_text = _find_in_card(card, REVIEWS_SELECTOR).text().strip()
+
+        if title is None:
+            raise ProductParseError(
+                "Product card title has no title attribute"
             )
+
+        try:
+            price = float(price_text.replace("$", ""))
+            num_of_reviews = int(reviews_text)
+        except ValueError as error:
+            raise ProductParseError(
+                f"Product card {title!r} has a malformed number"
+            ) from error
+
+        yield Product(
+            title=title.strip(),
+            description=_normalize_whitespace(description),
+            price=price,
+            rating=len(card.css(STAR_SELECTOR)),
+            num_of_reviews=num_of_reviews,
         )
 
-    return products
+
+def _parse_products_from_page(
+        driver: webdriver.Remote
+) -> Iterator[Product]:
+    """
+    Parse all products currently loaded on the page
+    from its html, fetched in a single WebDriver call.
+    """
+    return _parse_products_from_html(driver.page_source)
 
 
-def _load_all_products(driver: webdriver.Chrome) -> list[Product]:
+def _load_all_products(driver: webdriver.Remote) -> Iterator[Product]:
     """
     Click 'More' button until it disappears
     and return all loaded products.
     """
-    wait = WebDriverWait(driver, 5)
+    try:
+        all_loaded = driver.execute_async_script(
+            CLICK_ALL_MORE_JS,
+            MORE_APPEAR_TIMEOUT_MS,
+            MORE_HIDDEN_GRACE_MS,
+            MORE_CLICK_TIMEOUT_MS,
+            MORE_CLICK_RETRIES,
+        )
+    except WebDriverException:
+        all_loaded = False
 
-    while True:
-        try:
-            more_button = wait.until(
-                expected_conditions.element_to_be_clickable(
-                    (By.CLASS_NAME, "btn-primary")
-                )
-            )
-            driver.execute_script("arguments[0].click();", more_button)
-        except Exception:
-            break
+    if not all_loaded:
+        driver.execute_script(STOP_CLICKING_MORE_JS)
+        _click_more_until_hidden(driver)
 
     return _parse_products_from_page(driver)
 
 
-def _save_products_to_csv(file_name: str, products: list[Product]) -> None:
-    """Save products list to csv file as strings for testing consistency."""
-    with open(file_name, "w", newline="", encoding="utf-8") as csv_file:
-        writer = csv.writer(csv_file)
-        writer.writerow(
-            ["title", "description", "price", "rating", "num_of_reviews"]
-        )
+def _save_products_to_csv(
+        file_name: str,
+        products: Iterable[Product]
+) -> None:
+    """
+    Stream products to csv file through a single buffered write.
+    Rows go to a temporary file that replaces file_name only once
+    every product is written, so a parse error leaves no partial csv.
+    """
+    temp_file_name = f"{file_name}.tmp"
 
-        for product in products:
-            writer.writerow(
-                [
-                    product.title,
-                    product.description,
-                    str(product.price),
-                    str(product.rating),
-                    str(product.num_of_reviews),
-                ]
-            )
+    try:
+        with open(
+                temp_file_name,
+                "w",
+                newline="",
+                encoding="utf-8",
+                buffering=1 << 20,
+        ) as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(CSV_FIELDS)
+            writer.writerows(map(PRODUCT_ROW, products))
+
+        os.replace(temp_file_name, file_name)
+    except Exception:
+        with suppress(FileNotFoundError):
+            os.remove(temp_file_name)
+        raise
 
 
 def _scrape_page(
-        driver: webdriver.Chrome,
+        driver: webdriver.Remote,
+        page_url: str
+) -> Iterator[Product]:
+    """
+    General scraping logic for any page.
+    Returned products are parsed from a html snapshot,
+    so the driver is free as soon as this returns.
+    """
+    driver.get(page_url)
+    _accept_cookies(driver)
+
+    return _load_all_products(driver)
+
+
+def _scrape_page_with_pool(
+        pool: DriverPool,
         page_url: str,
         file_name: str
 ) -> None:
-    """General scraping logic for any page."""
-    driver.get(page_url)
-    _accept_cookies(driver)
+    """
+    Scrape a single page with a driver borrowed from the pool.
+    The driver goes back to the pool before parsing and csv writing,
+    so the next page loads while this one is being saved.
+    """
+    with pool.borrow() as driver:
+        products = _scrape_page(driver, page_url)
 
-    products = _load_all_products(driver)
     _save_products_to_csv(file_name, products)
 
 
-def get_all_products() -> None:
-    """Scrape all required pages and save to corresponding csv files."""
-    driver = _create_driver()
+def _scrape_page_over_http(
+        client: httpx.Client,
+        pool: DriverPool,
+        page_url: str,
+        file_name: str
+) -> None:
+    """
+    Scrape a server-rendered page without a browser,
+    falling back to the driver pool if the request fails,
+    no products come back or a card cannot be parsed.
+    """
+    try:
+        response = client.get(page_url)
+        response.raise_for_status()
+        products = list(_parse_products_from_html(response.text))
+    except (httpx.HTTPError, ProductParseError):
+        products = []
+
+    if not products:
+        _scrape_page_with_pool(pool, page_url, file_name)
+        return
+
+    _save_products_to_csv(file_name, products)
+
+
+def get_all_products(max_workers: int = 4) -> None:
+    """
+    Scrape all required pages concurrently
+    and save to corresponding csv files.
+    Set SELENIUM_REMOTE_URL to run browsers on a Selenium Grid,
+    with max_workers matching its SE_NODE_MAX_SESSIONS.
+    """
+    max_workers = min(max_workers, len(PAGES))
+    pool = DriverPool(os.environ.get("SELENIUM_REMOTE_URL"))
 
     try:
-        pages = {
-            "home.csv": HOME_URL,
-            "computers.csv": urljoin(HOME_URL, "computers"),
-            "laptops.csv": urljoin(HOME_URL, "computers/laptops"),
-            "tablets.csv": urljoin(HOME_URL, "computers/tablets"),
-            "phones.csv": urljoin(HOME_URL, "phones"),
-            "touch.csv": urljoin(HOME_URL, "phones/touch"),
-        }
+        with httpx.Client(
+                http2=True,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+        ) as client, ThreadPoolExecutor(max_workers=max_workers) as executor:
+            scrape_in_browser = partial(_scrape_page_with_pool, pool)
+            scrape_over_http = partial(_scrape_page_over_http, client, pool)
+            futures = [
+                executor.submit(
+                    scrape_in_browser
+                    if file_name in MORE_BUTTON_PAGES
+                    else scrape_over_http,
+                    page_url,
+                    file_name,
+                )
+                for file_name, page_url in PAGES.items()
+            ]
 
-        for file_name, page_url in pages.items():
-            _scrape_page(driver, page_url, file_name)
+            for future in futures:
+                future.result()
     finally:
-        driver.quit()
+        pool.close()
 
 
 if __name__ == "__main__":
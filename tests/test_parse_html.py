@@ -0,0 +1,279 @@
+import csv
+from pathlib import Path
+
+import httpx
+import pytest
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+import app.parse
+from app.parse import (
+    CARD_COUNT_JS,
+    CLEAR_STORAGE_JS,
+    DriverPool,
+    Product,
+    ProductParseError,
+    _click_more_until_hidden,
+    _parse_products_from_html,
+    _save_products_to_csv,
+    _scrape_page_over_http,
+)
+
+
+TEST_DIR = Path(__file__).resolve().parent
+
+
+def read_fixture_products() -> list[Product]:
+    html = (TEST_DIR / "product_cards.html").read_text(encoding="utf-8")
+    return list(_parse_products_from_html(html))
+
+
+def test_products_are_parsed_from_html():
+    assert read_fixture_products() == [
+        Product(
+            title="Asus VivoBook X441NA-GA190",
+            description=(
+                "Asus VivoBook X441NA-GA190 Chocolate Black, 14\", "
+                "Celeron N3450, 4GB, 128GB SSD, Endless OS, ENG kbd"
+            ),
+            price=295.99,
+            rating=5,
+            num_of_reviews=1,
+        ),
+        Product(
+            title="Prestigio SmartBook 133S Dark Grey",
+            description=(
+                "Prestigio SmartBook 133S Dark Grey, 13.3\" FHD IPS, "
+                "Celeron N3350 1.1GHz, 4GB, 32GB, Windows 10 Pro "
+                "+ Office 365 1 gadam"
+            ),
+            price=299.0,
+            rating=5,
+            num_of_reviews=9,
+        ),
+    ]
+
+
+def test_saved_csv_matches_correct_rows(tmp_path):
+    result_path = tmp_path / "laptops.csv"
+    _save_products_to_csv(str(result_path), read_fixture_products())
+
+    with open(TEST_DIR / "correct_laptops.csv", "r") as correct_file, open(result_path, "r") as result_file:
+        correct_rows = list(csv.reader(correct_file))[:3]
+        result_rows = list(csv.reader(result_file))
+
+    assert result_rows == correct_rows
+
+
+def test_failed_save_keeps_previous_csv(tmp_path):
+    result_path = tmp_path / "laptops.csv"
+    result_path.write_text("previous", encoding="utf-8")
+    broken_html = (TEST_DIR / "product_cards.html").read_text(
+        encoding="utf-8"
+    ).replace("$299.00", "")
+
+    with pytest.raises(ProductParseError):
+        _save_products_to_csv(
+            str(result_path), _parse_products_from_html(broken_html)
+        )
+
+    assert result_path.read_text(encoding="utf-8") == "previous"
+    assert list(tmp_path.iterdir()) == [result_path]
+
+
+class FakeMoreButton:
+    def __init__(self, batches: int, cards_per_click: int) -> None:
+        self.batches = batches
+        self.cards_per_click = cards_per_click
+        self.cards = 3
+        self.clicks = 0
+
+    def is_displayed(self) -> bool:
+        return self.clicks < self.batches
+
+    def is_enabled(self) -> bool:
+        return True
+
+    def click(self) -> None:
+        self.clicks += 1
+        self.cards += self.cards_per_click
+
+
+class FakeMoreDriver:
+    def __init__(self, button: FakeMoreButton) -> None:
+        self.button = button
+
+    def find_element(self, by: str, value: str) -> FakeMoreButton:
+        return self.button
+
+    def execute_script(self, script: str, *args) -> int | None:
+        if script == CARD_COUNT_JS:
+            return self.button.cards
+        args[0].click()
+        return None
+
+
+@pytest.fixture
+def fast_more_waits(monkeypatch):
+    monkeypatch.setattr(app.parse, "MORE_WAIT_TIMEOUT", 0.2)
+    monkeypatch.setattr(app.parse, "MORE_CLICK_TIMEOUT_MS", 200)
+    monkeypatch.setattr(app.parse, "WAIT_POLL_FREQUENCY", 0.01)
+
+
+def test_fallback_clicks_more_until_hidden(fast_more_waits):
+    button = FakeMoreButton(batches=3, cards_per_click=3)
+
+    _click_more_until_hidden(FakeMoreDriver(button))
+
+    assert button.clicks == 3
+    assert button.cards == 12
+
+
+def test_fallback_raises_when_click_adds_no_cards(fast_more_waits):
+    button = FakeMoreButton(batches=3, cards_per_click=0)
+
+    with pytest.raises(TimeoutException):
+        _click_more_until_hidden(FakeMoreDriver(button))
+
+    assert button.clicks == 1
+
+
+def test_fallback_raises_after_deadline(fast_more_waits, monkeypatch):
+    monkeypatch.setattr(app.parse, "MORE_FALLBACK_TIMEOUT", 0)
+    button = FakeMoreButton(batches=1000, cards_per_click=3)
+
+    with pytest.raises(TimeoutException):
+        _click_more_until_hidden(FakeMoreDriver(button))
+
+
+def scrape_over_mock_http(
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        status_code: int,
+        html: str,
+) -> list[str]:
+    browser_pages = []
+    monkeypatch.setattr(
+        app.parse,
+        "_scrape_page_with_pool",
+        lambda pool, page_url, file_name: browser_pages.append(page_url),
+    )
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(status_code, text=html)
+    )
+
+    with httpx.Client(transport=transport) as client:
+        _scrape_page_over_http(
+            client, None, "https://example.com/", str(tmp_path / "home.csv")
+        )
+
+    return browser_pages
+
+
+def test_http_page_is_saved_without_browser(tmp_path, monkeypatch):
+    html = (TEST_DIR / "product_cards.html").read_text(encoding="utf-8")
+
+    browser_pages = scrape_over_mock_http(tmp_path, monkeypatch, 200, html)
+
+    assert browser_pages == []
+    with open(tmp_path / "home.csv", "r") as result_file:
+        assert len(list(csv.reader(result_file))) == 3
+
+
+@pytest.mark.parametrize(
+    "status_code,html",
+    [
+        (503, "<html></html>"),
+        (200, "<html><body>No products</body></html>"),
+        (
+            200,
+            (TEST_DIR / "product_cards.html").read_text(
+                encoding="utf-8"
+            ).replace("$299.00", ""),
+        ),
+    ],
+    ids=["server-error", "no-cards", "broken-card"],
+)
+def test_http_page_falls_back_to_browser(
+        tmp_path, monkeypatch, status_code, html
+):
+    browser_pages = scrape_over_mock_http(
+        tmp_path, monkeypatch, status_code, html
+    )
+
+    assert browser_pages == ["https://example.com/"]
+    assert list(tmp_path.iterdir()) == []
+
+
+class FakePoolDriver:
+    def __init__(
+            self,
+            reset_fails: bool = False,
+            quit_fails: bool = False
+    ) -> None:
+        self.reset_fails = reset_fails
+        self.quit_fails = quit_fails
+        self.scripts = []
+        self.quit_calls = 0
+
+    def delete_all_cookies(self) -> None:
+        if self.reset_fails:
+            raise WebDriverException("session is gone")
+
+    def execute_script(self, script: str) -> None:
+        self.scripts.append(script)
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+        if self.quit_fails:
+            raise WebDriverException("quit failed")
+
+
+def use_fake_drivers(
+        monkeypatch: pytest.MonkeyPatch,
+        drivers: list[FakePoolDriver]
+) -> None:
+    created = iter(drivers)
+    monkeypatch.setattr(
+        app.parse, "_create_driver", lambda remote_url: next(created)
+    )
+
+
+def test_pool_resets_and_reuses_returned_driver(monkeypatch):
+    driver = FakePoolDriver()
+    use_fake_drivers(monkeypatch, [driver])
+    pool = DriverPool()
+
+    with pool.borrow() as first_driver:
+        pass
+    with pool.borrow() as second_driver:
+        pass
+
+    assert first_driver is second_driver is driver
+    assert driver.scripts == [CLEAR_STORAGE_JS, CLEAR_STORAGE_JS]
+
+
+def test_pool_drops_driver_that_fails_to_reset(monkeypatch):
+    dead_driver = FakePoolDriver(reset_fails=True, quit_fails=True)
+    fresh_driver = FakePoolDriver()
+    use_fake_drivers(monkeypatch, [dead_driver, fresh_driver])
+    pool = DriverPool()
+
+    with pytest.raises(RuntimeError):
+        with pool.borrow():
+            raise RuntimeError("scrape failed")
+
+    with pool.borrow() as driver:
+        assert driver is fresh_driver
+    assert dead_driver.quit_calls == 1
+
+
+def test_pool_close_quits_all_drivers_despite_errors(monkeypatch):
+    drivers = [FakePoolDriver(quit_fails=True), FakePoolDriver()]
+    use_fake_drivers(monkeypatch, drivers)
+    pool = DriverPool()
+
+    with pool.borrow(), pool.borrow():
+        pass
+    pool.close()
+
+    assert [driver.quit_calls for driver in drivers] == [1, 1]